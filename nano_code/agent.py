@@ -1,15 +1,31 @@
 """Core coding agent logic."""
 
-import os
-import platform
 import re
-from typing import Any
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, fields
 from collections.abc import Callable
+from functools import lru_cache
 import subprocess
 from jinja2 import Template
+from nano_code.local import LocalEnvironment
 from nano_code.openai_client import OpenAIClient
 
+_ACTION_RE = re.compile(r"```bash\n(.*?)\n```", re.DOTALL)
+_SUBMIT_MARKERS = frozenset({"MINI_SWE_AGENT_FINAL_OUTPUT", "COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT"})
+# Line boundaries recognised by str.splitlines()
+_LINE_BREAKS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+# Matches a submit marker alone on the first non-blank line, without copying the (possibly huge) output
+_SUBMIT_RE = re.compile(
+    r"\s*(?:" + "|".join(map(re.escape, _SUBMIT_MARKERS)) + ")"
+    rf"[^\S{_LINE_BREAKS}]*(?:\r\n|[{_LINE_BREAKS}]|\Z)"
+)
+
+
+@lru_cache(maxsize=512)
+def _compile_template(template: str) -> Template:
+    """Compile a Jinja template once; the agent renders the same few templates every step."""
+    return Template(template)
+
+
 class NonTerminatingException(Exception):
     """Raised for conditions that can be handled by the agent."""
 
@@ -33,7 +49,7 @@ class Submitted(TerminatingException):
 class LimitsExceeded(TerminatingException):
     """Raised when the agent has reached its cost or step limit."""
 
-@dataclass
+@dataclass(slots=True)
 class AgentConfig:
     # The default settings are the bare minimum to run the agent. Take a look at the config files for improved settings.
     system_template: str = "You are a helpful assistant that can do anything."
@@ -51,50 +67,28 @@ class AgentConfig:
     step_limit: int = 0
     cost_limit: float = 3.0
 
-@dataclass
-class LocalEnvironmentConfig:
-    cwd: str = ""
-    env: dict[str, str] = field(default_factory=dict)
-    timeout: int = 30
-
-class LocalEnvironment:
-    def __init__(self, *, config_class: type = LocalEnvironmentConfig, **kwargs):
-        """This class executes bash commands directly on the local machine."""
-        self.config = config_class(**kwargs)
-
-    def execute(self, command: str, cwd: str = ""):
-        """Execute a command in the local environment and return the result as a dict."""
-        cwd = cwd or self.config.cwd or os.getcwd()
-        result = subprocess.run(
-            command,
-            shell=True,
-            text=True,
-            cwd=cwd,
-            env=os.environ | self.config.env,
-            timeout=self.config.timeout,
-            encoding="utf-8",
-            errors="replace",
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-        )
-        return {"output": result.stdout, "returncode": result.returncode}
-
-    def get_template_vars(self) -> dict[str, Any]:
-        return asdict(self.config) | platform.uname()._asdict() | os.environ
-
 class CodingAgent:
     """A simple coding agent for analyzing and generating code."""
     
-    def __init__(self, env: LocalEnvironment, *, config_class: Callable = AgentConfig, **kwargs):
+    def __init__(
+        self,
+        env: LocalEnvironment,
+        *,
+        model: OpenAIClient | None = None,
+        config_class: Callable = AgentConfig,
+        **kwargs,
+    ):
+        """Pass `model` to share one client (and its HTTP connection pool) across agents."""
         self.config = config_class(**kwargs)
         self.messages: list[dict] = []
         self.env = env
-        self.model = OpenAIClient()
+        self.model = model if model is not None else OpenAIClient()
         self.extra_template_vars = {}
 
     def render_template(self, template: str, **kwargs) -> str:
-        template_vars = asdict(self.config) | self.env.get_template_vars() | self.model.get_template_vars()
-        return Template(template).render(**kwargs, **template_vars, **self.extra_template_vars)
+        config_vars = {f.name: getattr(self.config, f.name) for f in fields(self.config)}
+        template_vars = config_vars | self.env.get_template_vars() | self.model.get_template_vars()
+        return _compile_template(template).render(**kwargs, **template_vars, **self.extra_template_vars)
 
     def add_message(self, role: str, content: str, **kwargs):
         self.messages.append({"role": role, "content": content, **kwargs})
@@ -122,11 +116,14 @@ class CodingAgent:
         """Query the model and return the response."""
         if 0 < self.config.step_limit <= self.model.n_calls or 0 < self.config.cost_limit <= self.model.cost:
             raise LimitsExceeded()
-        response = self.model.query(self.messages)
+        response = self.model.query(self.messages, on_delta=self.on_delta)
         self.add_message("assistant", **response)
         
         return response
 
+    def on_delta(self, delta: str) -> None:
+        """Called with each chunk of the model response as it streams in."""
+
     def get_observation(self, response: dict) -> dict:
         """Execute the action and return the observation."""
         output = self.execute_action(self.parse_action(response))
@@ -137,7 +134,7 @@ class CodingAgent:
 
     def parse_action(self, response: dict) -> dict:
         """Parse the action from the message. Returns the action."""
-        actions = re.findall(r"```bash\n(.*?)\n```", response["content"], re.DOTALL)
+        actions = _ACTION_RE.findall(response["content"])
         
         if len(actions) == 1:
             return {"action": actions[0].strip(), **response}
@@ -159,7 +156,7 @@ class CodingAgent:
 
     def has_finished(self, output: dict[str, str]):
         """Raises Submitted exception with final output if the agent has finished its task."""
-        lines = output.get("output", "").lstrip().splitlines(keepends=True)
+        text = output.get("output", "")
         
-        if lines and lines[0].strip() in ["MINI_SWE_AGENT_FINAL_OUTPUT", "COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT"]:
-            raise Submitted("".join(lines[1:]))
\ No newline at end of file
+        if match := _SUBMIT_RE.match(text):
+            raise Submitted(text[match.end():])
\ No newline at end of file
@@ -8,6 +8,7 @@ There are three modes:
 
 import re
 from dataclasses import dataclass, field
+from functools import cache
 from typing import Literal
 
 from prompt_toolkit.history import FileHistory
@@ -21,7 +22,13 @@ console = Console(highlight=False)
 prompt_session = PromptSession(history=FileHistory("chat_history.txt"))
 
 
-@dataclass
+@cache
+def _whitelist_res(patterns: tuple[str, ...]) -> tuple[re.Pattern, ...]:
+    """Compile the whitelist once. Patterns stay separate so inline flags, group names and backreferences keep working."""
+    return tuple(re.compile(p) for p in patterns)
+
+
+@dataclass(slots=True)
 class ChatAgentConfig(AgentConfig):
     mode: Literal["human", "confirm", "yolo"] = "confirm"
     """Whether to confirm actions."""
@@ -37,22 +44,43 @@ class ChatAgent(CodingAgent):
     def __init__(self, *args, config_class=ChatAgentConfig, **kwargs):
         super().__init__(*args, config_class=config_class, **kwargs)
         self.cost_last_confirmed = 0.0
+        self._status = None
+        self._streaming = False
 
     def add_message(self, role: str, content: str, **kwargs):
         # Extend supermethod to print messages
         super().add_message(role, content, **kwargs)
+        if role == "assistant" and self._streaming:
+            # The content has already been printed by on_delta
+            self._streaming = False
+            console.print()
+            return
         if role == "assistant":
-            console.print(
-                f"\n[red][bold]nano-code[/bold] (step [bold]{self.model.n_calls}[/bold], [bold]${self.model.cost:.2f}[/bold]):[/red]\n",
-                end="",
-                highlight=False,
-            )
+            self._print_assistant_header(self.model.n_calls)
         else:
             console.print(f"\n[bold green]{role.capitalize()}[/bold green]:\n", end="", highlight=False)
         console.print(content, highlight=False, markup=False)
 
+    def _print_assistant_header(self, step: int) -> None:
+        console.print(
+            f"\n[red][bold]nano-code[/bold] (step [bold]{step}[/bold], [bold]${self.model.cost:.2f}[/bold]):[/red]\n",
+            end="",
+            highlight=False,
+        )
+
+    def on_delta(self, delta: str) -> None:
+        # Print the response live instead of waiting for it to complete
+        if not self._streaming:
+            self._streaming = True
+            if self._status is not None:
+                self._status.stop()
+            self._print_assistant_header(self.model.n_calls + 1)
+        console.print(delta, end="", highlight=False, markup=False)
+
     def query(self) -> dict:
         # Extend supermethod to handle human mode
+        # A previous stream may have been interrupted before its message was recorded
+        self._streaming = False
         if self.config.mode == "human":
             match command := self._prompt_and_handle_special("[bold yellow]>[/bold yellow] "):
                 case "/y" | "/c":  # Just go to the super query, which queries the LM for the next action
@@ -62,7 +90,7 @@ class ChatAgent(CodingAgent):
                     self.add_message("assistant", msg["content"])
                     return msg
         try:
-            with console.status("Waiting for the LM to respond..."):
+            with console.status("Waiting for the LM to respond...") as self._status:
                 return super().query()
         except LimitsExceeded:
             console.print(
@@ -96,7 +124,9 @@ class ChatAgent(CodingAgent):
         return super().execute_action(action)
 
     def should_ask_confirmation(self, action: str) -> bool:
-        return self.config.mode == "confirm" and not any(re.match(r, action) for r in self.config.whitelist_actions)
+        return self.config.mode == "confirm" and not any(
+            r.match(action) for r in _whitelist_res(tuple(self.config.whitelist_actions))
+        )
 
     def ask_confirmation(self) -> None:
         prompt = (
@@ -126,12 +156,12 @@ class ChatAgent(CodingAgent):
                 f"[bold green]/u[/bold green] to switch to [bold yellow]human[/bold yellow] mode (execute commands issued by the user)\n"
             )
             return self._prompt_and_handle_special(prompt)
-        if user_input in self._MODE_COMMANDS_MAPPING:
-            if self.config.mode == self._MODE_COMMANDS_MAPPING[user_input]:
+        if mode := self._MODE_COMMANDS_MAPPING.get(user_input):
+            if self.config.mode == mode:
                 return self._prompt_and_handle_special(
                     f"[bold red]Already in {self.config.mode} mode.[/bold red]\n{prompt}"
                 )
-            self.config.mode = self._MODE_COMMANDS_MAPPING[user_input]
+            self.config.mode = mode
             console.print(f"Switched to [bold green]{self.config.mode}[/bold green] mode.")
             return user_input
         return user_input
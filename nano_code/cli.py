@@ -1,38 +1,55 @@
 """Main CLI entry point for nano-code agent."""
 
 import typer
-import yaml
+from functools import cache
 from pathlib import Path
 from typing import Any
 import traceback
-from rich.console import Console
-from nano_code.chat_agent import ChatAgent
-from nano_code.local import LocalEnvironment
 from nano_code import global_config_dir
-from nano_code.utils.save import save_traj
-from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.shortcuts import PromptSession
 
 DEFAULT_OUTPUT = global_config_dir / "last_nano_code_run.traj.json"
-console = Console(highlight=False)
 app = typer.Typer(rich_markup_mode="rich")
 
-# Create a simple history file in the current directory
-prompt_session = PromptSession(history=FileHistory(global_config_dir / "nano_code_task_history.txt"))
+# Heavy dependencies (rich, prompt_toolkit, yaml, the agent itself) are imported lazily so that
+# `--help` and argument errors don't pay for them.
+
+
+@cache
+def _get_console():
+    from rich.console import Console
+
+    return Console(highlight=False)
+
+
+@cache
+def _get_prompt_session():
+    from prompt_toolkit.history import FileHistory
+    from prompt_toolkit.shortcuts import PromptSession
+
+    # Create a simple history file in the current directory
+    return PromptSession(history=FileHistory(global_config_dir / "nano_code_task_history.txt"))
+
 
 @app.command(help="Run the nano-code agent")
 def main(
     task: str | None = typer.Option(None, "-t", "--task", help="Task/problem statement", show_default=True),
     output: Path | None = typer.Option(DEFAULT_OUTPUT, "-o", "--output", help="Output trajectory file"),
 ) -> Any:
-    
+    import yaml
+    from nano_code.chat_agent import ChatAgent
+    from nano_code.local import LocalEnvironment
+    from nano_code.utils.save import save_traj
+
+    console = _get_console()
     config_path = Path(__file__).parent / "default.yaml"
-    config = yaml.safe_load(config_path.read_text())
+    # Prefer the libyaml-backed loader when PyYAML was built with it; the pure-Python one is much slower
+    config = yaml.load(config_path.read_bytes(), Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
 
     if not task:
+        from prompt_toolkit.formatted_text import HTML
+
         console.print("[bold yellow]What do you want to do?")
-        task = prompt_session.prompt(
+        task = _get_prompt_session().prompt(
             "",
             multiline=True,
             bottom_toolbar=HTML(
@@ -50,7 +67,7 @@ def main(
     try:
         exit_status, result = agent.run(task)  
     except Exception as e:
-        print(f"Error running agent: {e}", exc_info=True)
+        console.print(f"Error running agent: {e}", markup=False)
         exit_status, result = type(e).__name__, str(e)
         extra_info = {"traceback": traceback.format_exc()}
     finally:
@@ -59,4 +76,4 @@ def main(
     return agent
 
 if __name__ == "__main__":
-    app()
\ No newline at end of file
+    app()
@@ -1,11 +1,18 @@
 import os
 import platform
 import subprocess
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field, fields
+from functools import cache
 from typing import Any
 
 
-@dataclass
+@cache
+def _platform_vars() -> dict[str, str]:
+    """Host information is fixed for the life of the process, so build it once and share it."""
+    return platform.uname()._asdict()
+
+
+@dataclass(slots=True)
 class LocalEnvironmentConfig:
     cwd: str = ""
     env: dict[str, str] = field(default_factory=dict)
@@ -35,4 +42,5 @@ class LocalEnvironment:
         return {"output": result.stdout, "returncode": result.returncode}
 
     def get_template_vars(self) -> dict[str, Any]:
-        return asdict(self.config) | platform.uname()._asdict() | os.environ
+        config_vars = {f.name: getattr(self.config, f.name) for f in fields(self.config)}
+        return config_vars | _platform_vars() | os.environ
@@ -1,13 +1,22 @@
 """OpenAI client configuration and utilities."""
 
 import os
+from collections.abc import Callable
 from typing import Optional, Any
-from openai import OpenAI
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv(override=True)
 
+
+def _api_events(stream):
+    """Iterate over stream events, labelling transport errors (but not errors raised by the consumer)."""
+    try:
+        yield from stream
+    except Exception as e:
+        raise Exception(f"OpenAI API error: {e}")
+
+
 class OpenAIClient:
     """Wrapper for OpenAI API client."""
   
@@ -22,21 +31,44 @@ class OpenAIClient:
                 "or pass api_key parameter."
             )
         
+        from openai import OpenAI  # deferred: importing openai dominates CLI startup
+
         self.client = OpenAI(api_key=self.api_key)
         self.model = "gpt-5"  # Default model
         self.config = {
             "model": self.model,
         }
     
-    def _query(self, messages: list[dict[str, str]], max_tokens: int = 10000, **kwargs):
+    def _query(
+        self,
+        messages: list[dict[str, str]],
+        max_tokens: int = 10000,
+        on_delta: Optional[Callable[[str], None]] = None,
+        **kwargs,
+    ):
+        """Stream the response, passing text chunks to `on_delta` as they arrive. Returns the final response."""
         try:
-            return self.client.responses.create(
+            stream = self.client.responses.create(
                 model=self.model,
                 input=messages,
                 max_output_tokens=max_tokens,
+                stream=True,
             )
         except Exception as e:
-            raise Exception(f"OpenAI API error: {e}")   
+            raise Exception(f"OpenAI API error: {e}")
+        with stream:
+            for event in _api_events(stream):
+                match event.type:
+                    case "response.output_text.delta":
+                        if on_delta is not None:
+                            on_delta(event.delta)
+                    case "response.completed" | "response.incomplete":
+                        return event.response
+                    case "response.failed":
+                        raise Exception(f"OpenAI API error: {event.response.error}")
+                    case "error":
+                        raise Exception(f"OpenAI API error: {event.message}")
+        raise Exception("OpenAI API error: stream ended before the response completed")
        
     def cost_calculator(self, response: dict):
         input_token = response.usage.input_tokens
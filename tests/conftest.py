@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+
+import pytest
+
+from nano_code.openai_client import OpenAIClient
+
+
+class FakeStream:
+    """Stands in for the event stream returned by `responses.create(..., stream=True)`."""
+
+    def __init__(self, events):
+        self.events = events
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+
+
+def _text_events(text: str, input_tokens: int = 100, output_tokens: int = 10) -> list[SimpleNamespace]:
+    """Stream `text` one word at a time, then complete with the given usage."""
+    deltas = [SimpleNamespace(type="response.output_text.delta", delta=d) for d in text.split(" ")]
+    for delta in deltas[:-1]:
+        delta.delta += " "
+    usage = SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens)
+    response = SimpleNamespace(output_text=text, usage=usage)
+    return [*deltas, SimpleNamespace(type="response.completed", response=response)]
+
+
+@pytest.fixture
+def make_model():
+    """Build an OpenAIClient whose successive API calls replay the given event lists."""
+
+    def _make(*event_lists: list) -> OpenAIClient:
+        model = OpenAIClient(api_key="test-key")
+        model.streams = [FakeStream(events) for events in event_lists]
+        calls = iter(model.streams)
+        model.client = SimpleNamespace(responses=SimpleNamespace(create=lambda **kwargs: next(calls)))
+        return model
+
+    return _make
+
+
+@pytest.fixture
+def text_events():
+    """Build the event list for a successful streamed text response."""
+    return _text_events
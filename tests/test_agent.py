@@ -1,18 +1,20 @@
 from unittest.mock import patch
 
-from nano_code.agent import CodingAgent
+import pytest
+
+from nano_code.agent import CodingAgent, Submitted
+from nano_code.chat_agent import ChatAgent
 from nano_code.local import LocalEnvironment
-from nano_code.openai_client import OpenAIClient
 
 
-def test_successful_completion_with_confirmation():
+def test_successful_completion_with_confirmation(make_model, text_events):
     """Test agent completes successfully when user confirms all actions."""
     with patch(
-        "nano_code.agent.prompt_session.prompt", side_effect=["", ""]
+        "nano_code.chat_agent.prompt_session.prompt", side_effect=["", ""]
     ):  # Confirm action with Enter, then no new task
-        agent = CodingAgent(
-            model=OpenAIClient(
-                outputs=["Finishing\n```bash\necho 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'completed'\n```"]
+        agent = ChatAgent(
+            model=make_model(
+                text_events("Finishing\n```bash\necho 'COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT'\necho 'completed'\n```")
             ),
             env=LocalEnvironment(),
         )
@@ -20,4 +22,26 @@ def test_successful_completion_with_confirmation():
         exit_status, result = agent.run("Test completion with confirmation")
         assert exit_status == "Submitted"
         assert result == "completed\n"
-        assert agent.model.n_calls == 1
\ No newline at end of file
+        assert agent.model.n_calls == 1
+
+
+def test_agents_share_injected_model(make_model):
+    model = make_model()
+    first = CodingAgent(LocalEnvironment(), model=model)
+    second = CodingAgent(LocalEnvironment(), model=model)
+    assert first.model is model
+    assert second.model is model
+
+
+@pytest.mark.parametrize("line_break", ["\n", "\r\n", "\r", "\f", "\v", "\x1c", "\x85", " "])
+def test_has_finished_splits_on_any_line_boundary(line_break):
+    """The submit marker may be followed by any line boundary str.splitlines() recognises."""
+    agent = CodingAgent(LocalEnvironment(), model=object())
+    with pytest.raises(Submitted) as exc_info:
+        agent.has_finished({"output": f"  \nCOMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT \t{line_break}done\n"})
+    assert str(exc_info.value) == "done\n"
+
+
+def test_has_finished_ignores_marker_with_trailing_text():
+    agent = CodingAgent(LocalEnvironment(), model=object())
+    agent.has_finished({"output": "COMPLETE_TASK_AND_SUBMIT_FINAL_OUTPUT and more\ndone"})
@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+from nano_code.chat_agent import ChatAgent, console
+from nano_code.local import LocalEnvironment
+
+
+def _agent(**kwargs) -> ChatAgent:
+    return ChatAgent(LocalEnvironment(), model=object(), **kwargs)
+
+
+def test_whitelist_supports_inline_flags_and_backreferences():
+    """Whitelist entries are matched independently, so per-pattern regex features keep working."""
+    agent = _agent(whitelist_actions=[r"(?i)ls", r"(?P<x>a)(?P=x)", r"(x)", r"(b)\1"])
+    assert not agent.should_ask_confirmation("LS -la")
+    assert not agent.should_ask_confirmation("aa")
+    assert not agent.should_ask_confirmation("bb")
+    assert agent.should_ask_confirmation("rm -rf build")
+
+
+def test_no_confirmation_outside_confirm_mode():
+    agent = _agent(mode="yolo")
+    assert not agent.should_ask_confirmation("rm -rf build")
+
+
+def test_streamed_response_is_printed_once(make_model, text_events):
+    agent = ChatAgent(LocalEnvironment(), model=make_model(text_events("hello streaming world")), mode="yolo")
+    with console.capture() as capture:
+        agent.query()
+    assert capture.get().count("hello streaming world") == 1
+    assert agent.messages[-1] == {"role": "assistant", "content": "hello streaming world"}
+    assert agent.model.n_calls == 1
+
+
+def test_human_command_is_shown_after_interrupted_stream(make_model):
+    agent = ChatAgent(LocalEnvironment(), model=make_model(), mode="human")
+    agent._streaming = True  # left behind by a Ctrl-C in the middle of a stream
+    with patch("nano_code.chat_agent.prompt_session.prompt", return_value="ls -la"), console.capture() as capture:
+        agent.query()
+    assert "ls -la" in capture.get()
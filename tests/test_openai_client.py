@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+def test_query_streams_deltas_and_accounts_usage(make_model, text_events):
+    model = make_model(text_events("hello streaming world", input_tokens=1000, output_tokens=100))
+    deltas = []
+
+    response = model.query([{"role": "user", "content": "hi"}], on_delta=deltas.append)
+
+    assert deltas == ["hello ", "streaming ", "world"]
+    assert response == {"content": "hello streaming world"}
+    assert model.n_calls == 1
+    assert model.cost == pytest.approx(1000 * 0.00000125 + 100 * 0.00001)
+    assert model.streams[0].closed
+
+
+def test_query_surfaces_failed_response_error(make_model):
+    error = SimpleNamespace(code="server_error", message="model overloaded")
+    failed = SimpleNamespace(type="response.failed", response=SimpleNamespace(error=error))
+    model = make_model([failed])
+
+    with pytest.raises(Exception, match="model overloaded"):
+        model.query([])
+    assert model.n_calls == 0
+    assert model.streams[0].closed
+
+
+def test_query_surfaces_error_event(make_model):
+    model = make_model([SimpleNamespace(type="error", message="rate limit reached")])
+
+    with pytest.raises(Exception, match="OpenAI API error: rate limit reached"):
+        model.query([])
+
+
+def test_query_does_not_relabel_on_delta_errors(make_model, text_events):
+    model = make_model(text_events("hello world"))
+
+    def on_delta(delta):
+        raise ValueError("display failed")
+
+    with pytest.raises(ValueError, match="^display failed$"):
+        model.query([], on_delta=on_delta)
+    assert model.streams[0].closed